@@ -1,11 +1,15 @@
 """Core geometry utilities for SVG nesting operations."""
 
 import math
-from typing import List, Dict, Optional, Tuple, Union
+from itertools import islice
+from operator import mul
+from typing import List, Dict, Optional, Sequence, Tuple, Union
 
 TOL = 1e-9
 
 class Point:
+    __slots__ = ('x', 'y')
+    
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
@@ -13,21 +17,107 @@ class Point:
     def __repr__(self):
         return f"Point({self.x}, {self.y})"
     
+    def __iter__(self):
+        yield self.x
+        yield self.y
+    
     def to_dict(self):
         return {"x": self.x, "y": self.y}
 
 class Polygon:
-    def __init__(self, points: List[Point]):
-        self.points = points
+    """Polygon stored as parallel x/y coordinate tuples.
+    
+    Build it from a list of Points or directly from ``xs``/``ys`` sequences.
+    Whichever form is missing is derived lazily and cached, so geometry kernels
+    can work on the coordinates without Point objects ever being created.
+    Reassigning ``points`` resets the cache; mutating the list in place does not.
+    Rotated copies are cached per angle as well, so a part that is estimated and
+    nested again and again is only rotated once for each angle it is tried at.
+    """
+    
+    def __init__(self, points: Optional[List[Point]] = None,
+                 xs: Optional[Sequence[float]] = None, ys: Optional[Sequence[float]] = None):
+        if points is not None:
+            self.points = points
+        else:
+            self._points = None
+            self._xs = tuple(xs)
+            self._ys = tuple(ys)
+            self._extent = None
+            self._area = None
+            self._rotations = {}
         self.id = None
         self.rotation = 0
         self.children = []
     
+    @property
+    def points(self) -> List[Point]:
+        if self._points is None:
+            self._points = [Point(x, y) for x, y in zip(self._xs, self._ys)]
+        return self._points
+    
+    @points.setter
+    def points(self, points: List[Point]):
+        self._points = points
+        self._xs = None
+        self._ys = None
+        self._extent = None
+        self._area = None
+        self._rotations = {}
+    
+    @property
+    def xs(self) -> Tuple[float, ...]:
+        if self._xs is None:
+            self._xs = tuple([p.x for p in self._points])
+        return self._xs
+    
+    @property
+    def ys(self) -> Tuple[float, ...]:
+        if self._ys is None:
+            self._ys = tuple([p.y for p in self._points])
+        return self._ys
+    
+    @property
+    def extent(self) -> Tuple[float, float, float, float]:
+        """Cached (min_x, min_y, max_x, max_y) of a non-empty polygon."""
+        if self._extent is None:
+            xs = self.xs
+            ys = self.ys
+            self._extent = (min(xs), min(ys), max(xs), max(ys))
+        return self._extent
+    
+    @property
+    def area(self) -> float:
+        """Cached signed shoelace area."""
+        if self._area is None:
+            self._area = polygon_area_xy(self.xs, self.ys)
+        return self._area
+    
+    def copy(self) -> 'Polygon':
+        """New polygon sharing this one's coordinate tuples and cached geometry."""
+        clone = Polygon(xs=self.xs, ys=self.ys)
+        if clone._xs:
+            # Fill the parent's caches before sharing them, otherwise every copy
+            # would later recompute the same extent and area for itself
+            clone._extent = self.extent
+            clone._area = self.area
+        clone._rotations = self._rotations
+        return clone
+    
+    def rotated(self, degrees: float) -> 'Polygon':
+        """Cached copy rotated by degrees about the origin."""
+        rotated = self._rotations.get(degrees)
+        if rotated is None:
+            rotated = self._rotations[degrees] = rotate_polygon(self, degrees)
+        return rotated
+    
     def __getitem__(self, index):
         return self.points[index]
     
     def __len__(self):
-        return len(self.points)
+        if self._points is None:
+            return len(self._xs)
+        return len(self._points)
     
     def __iter__(self):
         return iter(self.points)
@@ -59,133 +149,139 @@ def normalize_vector(v: Point) -> Point:
 
 def line_intersect(A: Point, B: Point, E: Point, F: Point, infinite: bool = False) -> Optional[Point]:
     """Find intersection of two line segments AB and EF."""
-    a1 = B.y - A.y
-    b1 = A.x - B.x
-    c1 = B.x * A.y - A.x * B.y
-    a2 = F.y - E.y
-    b2 = E.x - F.x
-    c2 = F.x * E.y - E.x * F.y
-    
-    denom = a1 * b2 - a2 * b1
+    rx = B.x - A.x
+    ry = B.y - A.y
+    sx = F.x - E.x
+    sy = F.y - E.y
     
-    if almost_equal(denom, 0):
+    rxs = rx * sy - ry * sx
+    if -TOL < rxs < TOL:
         return None
     
-    x = (b1 * c2 - b2 * c1) / denom
-    y = (a2 * c1 - a1 * c2) / denom
+    # Parametric positions of the crossing along AB (t) and EF (u); the segments
+    # intersect when both lie in [0, 1].
+    qx = E.x - A.x
+    qy = E.y - A.y
+    t = (qx * sy - qy * sx) / rxs
+    u = (qx * ry - qy * rx) / rxs
     
-    if not (math.isfinite(x) and math.isfinite(y)):
-        return None
+    if infinite or (0 <= t <= 1 and 0 <= u <= 1):
+        return Point(A.x + t * rx, A.y + t * ry)
     
-    if not infinite:
-        if (abs(A.x - B.x) > TOL and 
-            ((A.x < B.x and (x < A.x or x > B.x)) or 
-             (A.x > B.x and (x > A.x or x < B.x)))):
-            return None
-        
-        if (abs(A.y - B.y) > TOL and 
-            ((A.y < B.y and (y < A.y or y > B.y)) or 
-             (A.y > B.y and (y > A.y or y < B.y)))):
-            return None
-        
-        if (abs(E.x - F.x) > TOL and 
-            ((E.x < F.x and (x < E.x or x > F.x)) or 
-             (E.x > F.x and (x > E.x or x < F.x)))):
-            return None
-        
-        if (abs(E.y - F.y) > TOL and 
-            ((E.y < F.y and (y < E.y or y > F.y)) or 
-             (E.y > F.y and (y > E.y or y < F.y)))):
-            return None
-    
-    return Point(x, y)
-
-def polygon_area(polygon: List[Point]) -> float:
+    return None
+
+def polygon_coords(polygon: Union[Polygon, List[Point]]) -> Tuple[Sequence[float], Sequence[float]]:
+    """Return parallel x and y coordinate sequences, using the Polygon cache if available."""
+    if isinstance(polygon, Polygon):
+        return polygon.xs, polygon.ys
+    return [p.x for p in polygon], [p.y for p in polygon]
+
+def polygon_area(polygon: Union[Polygon, List[Point]]) -> float:
     """Calculate polygon area using shoelace formula."""
     if len(polygon) < 3:
         return 0
     
-    area = 0
-    for i in range(len(polygon)):
-        j = (i + 1) % len(polygon)
-        area += polygon[i].x * polygon[j].y
-        area -= polygon[j].x * polygon[i].y
+    if isinstance(polygon, Polygon):
+        return polygon.area
     
+    xs, ys = polygon_coords(polygon)
+    return polygon_area_xy(xs, ys)
+
+def polygon_area_xy(xs: Sequence[float], ys: Sequence[float]) -> float:
+    """Shoelace area over parallel coordinate sequences."""
+    if len(xs) < 3:
+        return 0
+    
+    # Pair vertex i with i + 1 by offsetting one iterator (map stops at the
+    # shorter one), then close the ring with the wrap-around pair.
+    area = sum(map(mul, xs, islice(ys, 1, None))) - sum(map(mul, islice(xs, 1, None), ys))
+    area += xs[-1] * ys[0] - xs[0] * ys[-1]
     return area / 2
 
-def get_polygon_bounds(polygon: List[Point]) -> Dict[str, float]:
+def get_polygon_bounds(polygon: Union[Polygon, List[Point]]) -> Dict[str, float]:
     if not polygon:
         return {"x": 0, "y": 0, "width": 0, "height": 0}
     
-    min_x = min_y = float('inf')
-    max_x = max_y = float('-inf')
+    if isinstance(polygon, Polygon):
+        min_x, min_y, max_x, max_y = polygon.extent
+        return {"x": min_x, "y": min_y, "width": max_x - min_x, "height": max_y - min_y}
+    
+    xs, ys = polygon_coords(polygon)
+    return get_polygon_bounds_xy(xs, ys)
+
+def get_polygon_bounds_xy(xs: Sequence[float], ys: Sequence[float]) -> Dict[str, float]:
+    """Bounds of parallel coordinate sequences, reduced with C-level min/max."""
+    if not xs:
+        return {"x": 0, "y": 0, "width": 0, "height": 0}
     
-    for point in polygon:
-        min_x = min(min_x, point.x)
-        max_x = max(max_x, point.x)
-        min_y = min(min_y, point.y)
-        max_y = max(max_y, point.y)
+    min_x = min(xs)
+    min_y = min(ys)
     
     return {
         "x": min_x,
         "y": min_y,
-        "width": max_x - min_x,
-        "height": max_y - min_y
+        "width": max(xs) - min_x,
+        "height": max(ys) - min_y
     }
 
-def point_in_polygon(point: Point, polygon: List[Point]) -> bool:
+def point_in_polygon(point: Point, polygon: Union[Polygon, List[Point]]) -> bool:
     """Check if point is inside polygon using ray casting."""
     if len(polygon) < 3:
         return False
     
-    x, y = point.x, point.y
+    # A Polygon's cached extent rejects points clearly outside it before ray casting
+    if isinstance(polygon, Polygon):
+        min_x, min_y, max_x, max_y = polygon.extent
+        if not (min_x <= point.x <= max_x and min_y <= point.y <= max_y):
+            return False
+    
+    xs, ys = polygon_coords(polygon)
+    return point_in_polygon_xy(point.x, point.y, xs, ys)
+
+def point_in_polygon_xy(x: float, y: float, xs: Sequence[float], ys: Sequence[float]) -> bool:
+    """Ray-casting test of (x, y) against a ring given as parallel coordinate sequences."""
     inside = False
     
-    j = len(polygon) - 1
-    for i in range(len(polygon)):
-        xi, yi = polygon[i].x, polygon[i].y
-        xj, yj = polygon[j].x, polygon[j].y
-        
-        if ((yi > y) != (yj > y)) and (x < (xj - xi) * (y - yi) / (yj - yi) + xi):
+    # Carry the previous vertex (j = i - 1) through the loop, starting from the
+    # last one, so neither indexing nor modulo is needed per edge.
+    xj = xs[-1]
+    yj = ys[-1]
+    above_j = yj > y
+    for xi, yi in zip(xs, ys):
+        above_i = yi > y
+        if above_i != above_j and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
             inside = not inside
-        j = i
+        xj = xi
+        yj = yi
+        above_j = above_i
     
     return inside
 
-def rotate_polygon(polygon: List[Point], degrees: float) -> List[Point]:
+def rotate_polygon(polygon: Union[Polygon, List[Point]], degrees: float) -> Polygon:
+    xs, ys = polygon_coords(polygon)
+    vertices = list(zip(xs, ys))
+    
     angle = degrees_to_radians(degrees)
     cos_a = math.cos(angle)
     sin_a = math.sin(angle)
     
-    rotated = []
-    for point in polygon:
-        x = point.x * cos_a - point.y * sin_a
-        y = point.x * sin_a + point.y * cos_a
-        rotated.append(Point(x, y))
-    
-    return rotated
+    return Polygon(xs=[x * cos_a - y * sin_a for x, y in vertices],
+                   ys=[x * sin_a + y * cos_a for x, y in vertices])
 
-def translate_polygon(polygon: List[Point], dx: float, dy: float) -> List[Point]:
-    return [Point(p.x + dx, p.y + dy) for p in polygon]
+def translate_polygon(polygon: Union[Polygon, List[Point]], dx: float, dy: float) -> Polygon:
+    xs, ys = polygon_coords(polygon)
+    return Polygon(xs=[x + dx for x in xs], ys=[y + dy for y in ys])
 
-def get_leftmost_point(polygon: List[Point]) -> Point:
+def get_leftmost_point(polygon: Union[Polygon, List[Point]]) -> Point:
     if not polygon:
         return Point(0, 0)
     
-    leftmost = polygon[0]
-    for point in polygon[1:]:
-        if point.x < leftmost.x:
-            leftmost = point
-    
-    return leftmost
+    xs = polygon_coords(polygon)[0]
+    return polygon[xs.index(min(xs))]
 
-def get_rightmost_point(polygon: List[Point]) -> Point:
+def get_rightmost_point(polygon: Union[Polygon, List[Point]]) -> Point:
     if not polygon:
         return Point(0, 0)
     
-    rightmost = polygon[0]
-    for point in polygon[1:]:
-        if point.x > rightmost.x:
-            rightmost = point
-    
-    return rightmost 
\ No newline at end of file
+    xs = polygon_coords(polygon)[0]
+    return polygon[xs.index(max(xs))]
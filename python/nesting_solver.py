@@ -1,9 +1,13 @@
 """Nesting Solver using Genetic Algorithm for optimal placement."""
 
+import os
 import random
 import math
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Dict, Optional, Tuple, Callable
-from geometry_util import Point, Polygon, get_polygon_bounds, rotate_polygon, translate_polygon, polygon_area
+from geometry_util import Polygon, get_polygon_bounds, translate_polygon, polygon_area
 from nfp_calculator import NFPCalculator
 
 class Individual:
@@ -11,6 +15,77 @@ class Individual:
         self.genes = genes
         self.fitness = float('inf')
         self.placements = []
+        self.evaluated = False
+    
+    def genome_key(self) -> Tuple[Tuple[int, int], ...]:
+        return tuple((gene['id'], gene['rotation']) for gene in self.genes)
+
+# Per-process state for parallel fitness evaluation, set up by _init_worker so the
+# prepared parts are pickled once per worker rather than once per individual.
+_worker_state = None
+
+def _init_worker(config: Dict, parts: List[Dict], container: Polygon):
+    global _worker_state
+    solver = NestingSolver()
+    solver.config.update(config)
+    _worker_state = (solver, parts, container)
+
+def _evaluate_genes(genes: List[Dict]) -> Tuple[float, List[Dict]]:
+    solver, parts, container = _worker_state
+    return solver._evaluate_fitness(Individual(genes), parts, container)
+
+def _first_fit(container_min_x: float, container_min_y: float, container_max_x: float, container_max_y: float,
+               poly_x: float, poly_y: float, poly_w: float, poly_h: float, step: int,
+               placed_boxes: List[Tuple[float, float, float, float]]) -> Optional[Tuple[int, int]]:
+    """Return the first grid offset, in bottom-left order, that fits the polygon.
+    
+    The polygon is described by its bounds (poly_x, poly_y, poly_w, poly_h);
+    translating it by (x, y) shifts those bounds by the same amount, so each
+    candidate is tested as an AABB against the container and placed_boxes,
+    which holds (min_x, min_y, max_x, max_y) tuples. Returns None if no cell fits.
+    """
+    # Containment only depends on one axis at a time, so the grid is clipped to
+    # the container up front.
+    x_offsets = []
+    x_mins = []
+    x_maxs = []
+    for x in range(int(container_min_x), int(container_max_x - poly_w), step):
+        test_min_x = x + poly_x
+        test_max_x = test_min_x + poly_w
+        if test_min_x >= container_min_x and test_max_x <= container_max_x:
+            x_offsets.append(x)
+            x_mins.append(test_min_x)
+            x_maxs.append(test_max_x)
+    
+    if not x_offsets:
+        return None
+    
+    columns = len(x_offsets)
+    
+    for y in range(int(container_min_y), int(container_max_y - poly_h), step):
+        test_min_y = y + poly_y
+        test_max_y = test_min_y + poly_h
+        if test_min_y < container_min_y or test_max_y > container_max_y:
+            continue
+        
+        # Only parts overlapping this row's vertical band can block a cell in it
+        row_spans = [(min_x, max_x) for min_x, min_y, max_x, max_y in placed_boxes
+                     if not (test_max_y <= min_y or max_y <= test_min_y)]
+        
+        i = 0
+        while i < columns:
+            test_min_x = x_mins[i]
+            test_max_x = x_maxs[i]
+            for min_x, max_x in row_spans:
+                if not (test_max_x <= min_x or max_x <= test_min_x):
+                    # Cells further right keep overlapping this part until they
+                    # start at or beyond its right edge, so jump straight there.
+                    i = bisect_left(x_mins, max_x, i + 1)
+                    break
+            else:
+                return x_offsets[i], y
+    
+    return None
 
 class NestingSolver:
     def __init__(self):
@@ -19,160 +94,241 @@ class NestingSolver:
             'mutation_rate': 10,
             'rotations': 4,
             'spacing': 0,
-            'max_generations': 50
+            'max_generations': 50,
+            'workers': 1,
+            'seed': None
         }
         self.nfp_calculator = NFPCalculator()
+        self._rng = random.Random()
     
     def solve(self, parts: List[Polygon], container: Polygon) -> Dict:
         if not parts or not container:
             return {'fitness': float('inf'), 'placements': []}
         
+        angles = [(360 / self.config['rotations']) * r for r in range(self.config['rotations'])]
+        
+        # Instances made with Polygon.copy() share their coordinate tuples, so
+        # the rotation table is built once per distinct geometry and shared
+        # (which also lets pickle send it to pool workers only once)
         prepared_parts = []
+        rotation_tables = {}
         for i, part in enumerate(parts):
-            part_data = {'id': i, 'polygon': part, 'rotations': []}
-            for r in range(self.config['rotations']):
-                angle = (360 / self.config['rotations']) * r
-                rotated = rotate_polygon(part.points, angle)
-                part_data['rotations'].append({'angle': angle, 'polygon': rotated})
-            prepared_parts.append(part_data)
+            key = (id(part.xs), id(part.ys))
+            rotations = rotation_tables.get(key)
+            if rotations is None:
+                rotations = rotation_tables[key] = []
+                for angle in angles:
+                    rotated = part.rotated(angle)
+                    rotations.append({'angle': angle, 'polygon': rotated,
+                                      'bounds': get_polygon_bounds(rotated)})
+            prepared_parts.append({'id': i, 'polygon': part, 'rotations': rotations})
+        
+        # Without an explicit seed, draw one from the global generator so that
+        # random.seed() still makes runs reproducible.
+        seed = self.config['seed']
+        self._rng = rng = random.Random(random.getrandbits(64) if seed is None else seed)
+        
+        # Draw every initial rotation index in one batch, then slice per individual
+        population_size = self.config['population_size']
+        rotation_draws = rng.choices(range(len(angles)), k=population_size * len(prepared_parts))
         
         population = []
-        for _ in range(self.config['population_size']):
-            genes = []
-            for part in prepared_parts:
-                gene = {
-                    'id': part['id'],
-                    'rotation': random.randint(0, len(part['rotations']) - 1)
-                }
-                genes.append(gene)
-            random.shuffle(genes)
+        for n in range(population_size):
+            offset = n * len(prepared_parts)
+            genes = [{'id': part['id'], 'rotation': rotation_draws[offset + k]}
+                     for k, part in enumerate(prepared_parts)]
+            rng.shuffle(genes)
             population.append(Individual(genes))
         
         best_individual = None
         best_fitness = float('inf')
         no_improvement_count = 0
         
-        for generation in range(self.config['max_generations']):
-            generation_best = float('inf')
-            
-            for individual in population:
-                fitness, placements = self._evaluate_fitness(individual, prepared_parts, container)
-                individual.fitness = fitness
-                individual.placements = placements
+        pool = self._create_pool(prepared_parts, container)
+        try:
+            for generation in range(self.config['max_generations']):
+                generation_best = float('inf')
                 
-                if fitness < best_fitness:
-                    best_fitness = fitness
-                    best_individual = individual
-                    no_improvement_count = 0
+                pool = self._evaluate_population(population, prepared_parts, container, pool)
                 
-                generation_best = min(generation_best, fitness)
-            
-            # Early termination if no improvement for 10 generations
-            if generation_best >= best_fitness:
-                no_improvement_count += 1
-                if no_improvement_count >= 10:
-                    break
-            
-            population.sort(key=lambda x: x.fitness)
-            new_population = population[:self.config['population_size']//2]
-            
-            while len(new_population) < self.config['population_size']:
-                parent1 = random.choice(population[:5])
-                parent2 = random.choice(population[:5])
-                child = self._crossover(parent1, parent2)
-                child = self._mutate(child)
-                new_population.append(child)
-            
-            population = new_population
+                for individual in population:
+                    fitness = individual.fitness
+                    
+                    if fitness < best_fitness:
+                        best_fitness = fitness
+                        best_individual = individual
+                        no_improvement_count = 0
+                    
+                    generation_best = min(generation_best, fitness)
+                
+                # Early termination if no improvement for 10 generations
+                if generation_best >= best_fitness:
+                    no_improvement_count += 1
+                    if no_improvement_count >= 10:
+                        break
+                
+                population.sort(key=lambda x: x.fitness)
+                new_population = population[:self.config['population_size']//2]
+                
+                # Pick all parent pairs for this generation in one batch
+                children = self.config['population_size'] - len(new_population)
+                first_parents = rng.choices(population[:5], k=children)
+                second_parents = rng.choices(population[:5], k=children)
+                
+                for parent1, parent2 in zip(first_parents, second_parents):
+                    child = self._crossover(parent1, parent2)
+                    child = self._mutate(child)
+                    new_population.append(child)
+                
+                population = new_population
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
         
+        placements = best_individual.placements if best_individual else []
+        
+        # Placed copies keep their source part's area, which each part has cached
         return {
             'fitness': best_fitness,
-            'placements': best_individual.placements if best_individual else []
+            'placements': placements,
+            'total_placed_area': sum(abs(parts[placement['id']].area) for placement in placements)
         }
     
+    def _create_pool(self, parts: List[Dict], container: Polygon) -> Optional[ProcessPoolExecutor]:
+        """Start a worker pool for fitness evaluation, or return None to evaluate serially."""
+        workers = self.config['workers']
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, self.config['population_size'])
+        if workers <= 1:
+            return None
+        
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                   initargs=(self.config, parts, container))
+    
+    def _evaluate_population(self, population: List[Individual], parts: List[Dict], container: Polygon,
+                             pool: Optional[ProcessPoolExecutor]) -> Optional[ProcessPoolExecutor]:
+        """Assign fitness and placements to every individual that has not been evaluated yet.
+        
+        Survivors from the previous generation keep their results, and individuals
+        sharing a genome with an already evaluated one (or with each other) reuse
+        its results, so _evaluate_fitness runs once per distinct new genome.
+        Returns the pool to use for the next generation, which is None once the
+        pool has broken and evaluation has fallen back to this process.
+        """
+        known = {individual.genome_key(): (individual.fitness, individual.placements)
+                 for individual in population if individual.evaluated}
+        pending = {}
+        
+        for individual in population:
+            if individual.evaluated:
+                continue
+            key = individual.genome_key()
+            if key in known:
+                individual.fitness, individual.placements = known[key]
+                individual.evaluated = True
+            else:
+                pending.setdefault(key, []).append(individual)
+        
+        if not pending:
+            return pool
+        
+        groups = list(pending.values())
+        if pool is not None:
+            try:
+                results = list(pool.map(_evaluate_genes, [group[0].genes for group in groups]))
+            except BrokenProcessPool:
+                # Workers could not start, e.g. an unguarded script on a
+                # spawn-based platform; evaluate serially from here on
+                pool.shutdown(wait=False)
+                pool = None
+        if pool is None:
+            results = [self._evaluate_fitness(group[0], parts, container) for group in groups]
+        
+        for group, (fitness, placements) in zip(groups, results):
+            for individual in group:
+                individual.fitness = fitness
+                individual.placements = placements
+                individual.evaluated = True
+        
+        return pool
+    
     def _evaluate_fitness(self, individual: Individual, parts: List[Dict], container: Polygon) -> Tuple[float, List[Dict]]:
         placements = []
-        container_bounds = get_polygon_bounds(container.points)
+        container_bounds = get_polygon_bounds(container)
+        
+        # AABBs of the placements, grown as parts are placed so _find_position
+        # never has to rebuild them from the placement dicts
+        placed_boxes = []
+        
+        # Running extent of everything placed so far
+        min_x = min_y = float('inf')
+        max_x = max_y = float('-inf')
         
         for gene in individual.genes:
             part = parts[gene['id']]
             rotation_data = part['rotations'][gene['rotation']]
             polygon = rotation_data['polygon']
             
-            position = self._find_position(polygon, placements, container_bounds)
+            position = self._find_position(polygon, placed_boxes, container_bounds)
             if position:
+                x = position['x']
+                y = position['y']
                 placement = {
                     'id': gene['id'],
-                    'x': position['x'],
-                    'y': position['y'],
+                    'x': x,
+                    'y': y,
                     'rotation': rotation_data['angle'],
-                    'polygon': translate_polygon(polygon, position['x'], position['y'])
+                    'polygon': translate_polygon(polygon, x, y)
                 }
                 placements.append(placement)
+                
+                rotated_bounds = rotation_data['bounds']
+                box_x = rotated_bounds['x'] + x
+                box_y = rotated_bounds['y'] + y
+                box = (box_x, box_y, box_x + rotated_bounds['width'], box_y + rotated_bounds['height'])
+                placed_boxes.append(box)
+                
+                min_x = min(min_x, box[0])
+                min_y = min(min_y, box[1])
+                max_x = max(max_x, box[2])
+                max_y = max(max_y, box[3])
         
         if not placements:
             return float('inf'), []
         
-        all_points = []
-        for placement in placements:
-            all_points.extend(placement['polygon'])
-        
-        bounds = get_polygon_bounds(all_points)
-        fitness = bounds['width'] * bounds['height']
+        fitness = (max_x - min_x) * (max_y - min_y)
         
         return fitness, placements
     
-    def _find_position(self, polygon: List[Point], placed: List[Dict], container_bounds: Dict) -> Optional[Dict]:
+    def _find_position(self, polygon: Polygon, placed_boxes: List[Tuple[float, float, float, float]],
+                       container_bounds: Dict) -> Optional[Dict]:
+        """Find a bottom-left position for polygon clear of the (min_x, min_y, max_x, max_y) placed_boxes."""
         poly_bounds = get_polygon_bounds(polygon)
         
         # Bottom-left strategy: try bottom positions first, then left-to-right
         step_size = max(20, min(poly_bounds['width'], poly_bounds['height']) // 4)
         
-        # Sort y positions from bottom to top for bottom-left strategy
-        y_positions = list(range(int(container_bounds['y']), 
-                                int(container_bounds['y'] + container_bounds['height'] - poly_bounds['height']), 
-                                int(step_size)))
+        position = _first_fit(container_bounds['x'], container_bounds['y'],
+                              container_bounds['x'] + container_bounds['width'],
+                              container_bounds['y'] + container_bounds['height'],
+                              poly_bounds['x'], poly_bounds['y'], poly_bounds['width'], poly_bounds['height'],
+                              int(step_size), placed_boxes)
+        if position is None:
+            return None
         
-        for y in y_positions:
-            for x in range(int(container_bounds['x']), 
-                          int(container_bounds['x'] + container_bounds['width'] - poly_bounds['width']), int(step_size)):
-                
-                test_polygon = translate_polygon(polygon, x, y)
-                test_bounds = get_polygon_bounds(test_polygon)
-                
-                if (test_bounds['x'] >= container_bounds['x'] and
-                    test_bounds['y'] >= container_bounds['y'] and
-                    test_bounds['x'] + test_bounds['width'] <= container_bounds['x'] + container_bounds['width'] and
-                    test_bounds['y'] + test_bounds['height'] <= container_bounds['y'] + container_bounds['height']):
-                    
-                    valid = True
-                    for placed_part in placed:
-                        placed_bounds = get_polygon_bounds(placed_part['polygon'])
-                        if self._bounds_overlap(test_bounds, placed_bounds):
-                            valid = False
-                            break
-                    
-                    if valid:
-                        return {'x': x, 'y': y}
-        
-        return None
-    
-    def _bounds_overlap(self, bounds1: Dict, bounds2: Dict) -> bool:
-        return not (bounds1['x'] + bounds1['width'] <= bounds2['x'] or
-                   bounds2['x'] + bounds2['width'] <= bounds1['x'] or
-                   bounds1['y'] + bounds1['height'] <= bounds2['y'] or
-                   bounds2['y'] + bounds2['height'] <= bounds1['y'])
+        return {'x': position[0], 'y': position[1]}
     
     def _crossover(self, parent1: Individual, parent2: Individual) -> Individual:
         size = len(parent1.genes)
-        cut = random.randint(1, size - 1)
+        cut = self._rng.randint(1, size - 1)
         
         child_genes = parent1.genes[:cut] + parent2.genes[cut:]
         return Individual(child_genes)
     
     def _mutate(self, individual: Individual) -> Individual:
-        if random.randint(1, 100) <= self.config['mutation_rate']:
+        if self._rng.randint(1, 100) <= self.config['mutation_rate']:
             if len(individual.genes) > 1:
-                i, j = random.sample(range(len(individual.genes)), 2)
+                i, j = self._rng.sample(range(len(individual.genes)), 2)
                 individual.genes[i], individual.genes[j] = individual.genes[j], individual.genes[i]
         return individual 
\ No newline at end of file
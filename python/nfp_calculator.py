@@ -1,8 +1,14 @@
 """No-Fit Polygon (NFP) Calculator for SVG nesting."""
 
 import math
-from typing import List, Dict, Optional, Tuple
-from geometry_util import Point, Polygon, almost_equal, line_intersect, polygon_area, point_in_polygon
+from itertools import chain, islice
+from typing import List, Dict, Optional, Sequence, Tuple
+from geometry_util import TOL, Point, Polygon, line_intersect, polygon_area, polygon_area_xy, polygon_coords, point_in_polygon
+
+# Relative band around the squared tolerance test inside which rounding could
+# flip the result, so _simplify_mask falls back to the exact distance there
+_LOWER_MARGIN = 1 - 1e-9
+_UPPER_MARGIN = 1 + 1e-9
 
 class NFPCalculator:
     def __init__(self):
@@ -13,53 +19,43 @@ class NFPCalculator:
         if len(stationary) < 3 or len(moving) < 3:
             return []
         
-        if polygon_area(stationary) < 0:
-            stationary = list(reversed(stationary))
-        if polygon_area(moving) > 0:
-            moving = list(reversed(moving))
-        
-        nfp_points = []
-        
-        for i in range(len(stationary)):
-            edge_start = stationary[i]
-            edge_end = stationary[(i + 1) % len(stationary)]
-            
-            nfp_segment = self._calculate_nfp_segment(edge_start, edge_end, moving)
-            nfp_points.extend(nfp_segment)
-        
-        if len(nfp_points) < 3:
-            return []
-        
-        nfp_points = self._remove_duplicate_points(nfp_points)
+        # Fix winding: a clockwise stationary ring is read back to front through a
+        # slice, and since only the moving polygon's first vertex is used,
+        # reversing it just means taking its last vertex instead.
+        xs, ys = polygon_coords(stationary)
+        if polygon_area_xy(xs, ys) < 0:
+            xs = xs[::-1]
+            ys = ys[::-1]
+        reference_point = moving[-1] if polygon_area(moving) > 0 else moving[0]
+        
+        # Every stationary edge contributes its start and end vertex shifted by the
+        # reference point, so the whole ring is built from one shifted copy of the
+        # vertices interleaved with its rotation by one.
+        start_xs = [x - reference_point.x for x in xs]
+        start_ys = [y - reference_point.y for y in ys]
+        nfp_xs = [v for edge in zip(start_xs, start_xs[1:] + start_xs[:1]) for v in edge]
+        nfp_ys = [v for edge in zip(start_ys, start_ys[1:] + start_ys[:1]) for v in edge]
+        
+        nfp_points = self._remove_duplicate_coords(nfp_xs, nfp_ys)
         
         return [nfp_points] if len(nfp_points) >= 3 else []
     
-    def _calculate_nfp_segment(self, edge_start: Point, edge_end: Point, moving: List[Point]) -> List[Point]:
-        reference_point = moving[0]
-        
-        segment = []
-        
-        nfp_start = Point(edge_start.x - reference_point.x, edge_start.y - reference_point.y)
-        nfp_end = Point(edge_end.x - reference_point.x, edge_end.y - reference_point.y)
-        
-        segment.append(nfp_start)
-        segment.append(nfp_end)
-        
-        return segment
-    
-    def _remove_duplicate_points(self, points: List[Point]) -> List[Point]:
-        if not points:
+    def _remove_duplicate_coords(self, xs: Sequence[float], ys: Sequence[float]) -> List[Point]:
+        if not xs:
             return []
         
-        cleaned = [points[0]]
-        for i in range(1, len(points)):
-            if not (almost_equal(points[i].x, cleaned[-1].x) and 
-                   almost_equal(points[i].y, cleaned[-1].y)):
-                cleaned.append(points[i])
+        last_x = xs[0]
+        last_y = ys[0]
+        cleaned = [Point(last_x, last_y)]
+        for x, y in zip(xs, ys):
+            if not (-TOL < x - last_x < TOL and -TOL < y - last_y < TOL):
+                cleaned.append(Point(x, y))
+                last_x = x
+                last_y = y
         
         if (len(cleaned) > 1 and 
-            almost_equal(cleaned[-1].x, cleaned[0].x) and 
-            almost_equal(cleaned[-1].y, cleaned[0].y)):
+            -TOL < cleaned[-1].x - cleaned[0].x < TOL and 
+            -TOL < cleaned[-1].y - cleaned[0].y < TOL):
             cleaned.pop()
         
         return cleaned
@@ -106,25 +102,45 @@ class NFPCalculator:
         if len(nfp) < 3:
             return nfp
         
-        simplified = []
-        
-        for i in range(len(nfp)):
-            current = nfp[i]
-            prev_point = nfp[i - 1]
-            next_point = nfp[(i + 1) % len(nfp)]
-            
-            if not self._point_on_line(prev_point, next_point, current, tolerance):
-                simplified.append(current)
+        xs, ys = polygon_coords(nfp)
+        keep = self._simplify_mask(xs, ys, tolerance)
+        simplified = [point for point, kept in zip(nfp, keep) if kept]
         
         return simplified if len(simplified) >= 3 else nfp
     
-    def _point_on_line(self, p1: Point, p2: Point, point: Point, tolerance: float) -> bool:
-        dx = p2.x - p1.x
-        dy = p2.y - p1.y
-        
-        if almost_equal(dx, 0) and almost_equal(dy, 0):
-            return False
-        
-        distance = abs(dy * point.x - dx * point.y + p2.x * p1.y - p2.y * p1.x) / math.sqrt(dx * dx + dy * dy)
-        
-        return distance < tolerance 
\ No newline at end of file
+    def _simplify_mask(self, xs: Sequence[float], ys: Sequence[float], tolerance: float) -> List[bool]:
+        """Flag each vertex that is not within tolerance of the line through its neighbours."""
+        tolerance_sq = tolerance * tolerance
+        keep = []
+        
+        # Carry the previous (x1, y1) and current (x, y) vertices forward while
+        # iterating the next ones, wrapping to vertex 0 at the end.
+        x1 = xs[-1]
+        y1 = ys[-1]
+        x = xs[0]
+        y = ys[0]
+        for x2, y2 in zip(chain(islice(xs, 1, None), xs[:1]), chain(islice(ys, 1, None), ys[:1])):
+            dx = x2 - x1
+            dy = y2 - y1
+            if -TOL < dx < TOL and -TOL < dy < TOL:
+                keep.append(True)
+            else:
+                # Compare squared distance to the line so no sqrt is needed, except
+                # within rounding of the boundary, where the exact distance test
+                # decides so a vertex at exactly tolerance is still kept
+                cross = dy * x - dx * y + x2 * y1 - y2 * x1
+                length_sq = dx * dx + dy * dy
+                cross_sq = cross * cross
+                limit = tolerance_sq * length_sq
+                if cross_sq > limit * _UPPER_MARGIN:
+                    keep.append(True)
+                elif cross_sq < limit * _LOWER_MARGIN:
+                    keep.append(False)
+                else:
+                    keep.append(not abs(cross) / math.sqrt(length_sq) < tolerance)
+            x1 = x
+            y1 = y
+            x = x2
+            y = y2
+        
+        return keep
@@ -2,11 +2,22 @@
 
 import json
 import math
-from typing import List, Dict, Optional, Callable, Union, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Optional, Callable, Union, Tuple, Iterator
 from svg_parser import SVGParser
-from geometry_util import Point, Polygon, get_polygon_bounds
+from geometry_util import Point, Polygon, get_polygon_bounds, polygon_coords
 from nesting_solver import NestingSolver
 
+def _svg_points(polygon: Union[Polygon, List[Point]]) -> str:
+    """Format vertices as an SVG points attribute, "x,y x,y ...", with a single %-format."""
+    xs, ys = polygon_coords(polygon)
+    coords = [None] * (2 * len(xs))
+    coords[0::2] = xs
+    coords[1::2] = ys
+    return ('%s,%s ' * len(xs) % tuple(coords))[:-1]
+
 class SVGNester:
     def __init__(self):
         self.parser = SVGParser()
@@ -39,13 +50,10 @@ class SVGNester:
         if rotation_angles is None:
             rotation_angles = [0, 90, 180, 270]
         
-        from geometry_util import rotate_polygon
-        
         best_estimate = 0
         
         for angle in rotation_angles:
-            rotated_part = rotate_polygon(part.points, angle)
-            bounds = get_polygon_bounds(rotated_part)
+            bounds = get_polygon_bounds(part.rotated(angle))
             
             part_width = bounds['width'] + spacing
             part_height = bounds['height'] + spacing
@@ -59,7 +67,8 @@ class SVGNester:
         return best_estimate
     
     def nest_max_quantity(self, part: Polygon, sheet_width: float, sheet_height: float,
-                         max_attempts: int = 3, spacing: float = 0, units: str = "mm") -> Dict:
+                         max_attempts: int = 3, spacing: float = 0, units: str = "mm",
+                         workers: Optional[int] = 1) -> Dict:
         sheet = self.create_standard_sheet(sheet_width, sheet_height, units)
         self.set_container(sheet)
         
@@ -69,45 +78,74 @@ class SVGNester:
         best_result = None
         best_quantity = 0
         
-        test_quantities = []
-        
-        for factor in [1.0, 0.9, 0.8, 0.7, 0.6, 0.5]:
-            qty = max(1, int(estimated_max * factor))
-            if qty not in test_quantities:
-                test_quantities.append(qty)
-        
-        for qty in [1, 2, 4, 8, 16, 32]:
-            if qty not in test_quantities and qty <= estimated_max:
-                test_quantities.append(qty)
-        
-        test_quantities.sort(reverse=True)
-        test_quantities = test_quantities[:max_attempts]
+        test_quantities = {max(1, int(estimated_max * factor)) for factor in (1.0, 0.9, 0.8, 0.7, 0.6, 0.5)}
+        test_quantities.update(qty for qty in (1, 2, 4, 8, 16, 32) if qty <= estimated_max)
+        test_quantities = sorted(test_quantities, reverse=True)[:max_attempts]
         
         print(f"Testing quantities: {test_quantities}")
         
-        for quantity in test_quantities:
-            print(f"Attempting to nest {quantity} copies...")
-            
-            self.set_parts([part], quantity)
-            
-            try:
-                result = self.nest()
-                placed_count = len(result['placements'])
-                
-                print(f"  → Successfully placed {placed_count} out of {quantity}")
-                
-                if placed_count > best_quantity:
-                    best_quantity = placed_count
-                    best_result = result.copy()
-                    best_result['attempted_quantity'] = quantity
+        # With several workers every attempt is submitted up front, each running
+        # its GA serially, and the results are consumed in the same order as the
+        # sequential loop. A perfect fit stops the search without waiting for the
+        # attempts still running; their results are discarded.
+        if workers is None:
+            workers = os.cpu_count() or 1
+        workers = min(workers, len(test_quantities))
+        executor = None
+        attempts = None
+        if workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            config = dict(self.solver.config, workers=1)
+            attempts = [executor.submit(_attempt_nest, part, quantity, sheet, config)
+                        for quantity in test_quantities]
+        
+        # Instances differ only in id and copy number, so they are built once for
+        # the largest candidate and each attempt nests a prefix of them
+        self.set_parts([part], max(test_quantities, default=0))
+        all_parts = self.parts
+        
+        try:
+            for i, quantity in enumerate(test_quantities):
+                print(f"Attempting to nest {quantity} copies...")
                 
-                if placed_count == quantity:
-                    print(f"  → Perfect fit! All {quantity} parts placed.")
-                    break
+                try:
+                    if attempts is not None:
+                        try:
+                            result = attempts[i].result()
+                        except BrokenProcessPool:
+                            # Workers could not start, e.g. an unguarded script on a
+                            # spawn-based platform; finish the search in this process
+                            print("  → Worker pool failed, continuing sequentially")
+                            attempts = None
+                    if attempts is None:
+                        self.parts = all_parts[:quantity]
+                        self.part_quantities[0] = quantity
+                        result = self.nest()
+                    placed_count = len(result['placements'])
                     
-            except Exception as e:
-                print(f"  → Error with quantity {quantity}: {e}")
-                continue
+                    print(f"  → Successfully placed {placed_count} out of {quantity}")
+                    
+                    if placed_count > best_quantity:
+                        best_quantity = placed_count
+                        best_result = result.copy()
+                        best_result['attempted_quantity'] = quantity
+                    
+                    if placed_count == quantity:
+                        print(f"  → Perfect fit! All {quantity} parts placed.")
+                        break
+                        
+                except Exception as e:
+                    print(f"  → Error with quantity {quantity}: {e}")
+                    continue
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+        
+        # Leave the instances behind the best result in place so its placement
+        # ids resolve against self.parts
+        if best_result is not None:
+            self.parts = all_parts[:best_result['attempted_quantity']]
+            self.part_quantities[0] = best_result['attempted_quantity']
         
         if best_result is None:
             return {
@@ -171,6 +209,13 @@ class SVGNester:
             print("No placements to visualize")
             return
         
+        with open(output_path, 'w', buffering=1 << 20) as f:
+            f.writelines(self._sheet_layout_svg_chunks(result, show_grid, show_dimensions))
+        
+        print(f"Sheet layout saved to {output_path}")
+    
+    def _sheet_layout_svg_chunks(self, result: Dict, show_grid: bool, show_dimensions: bool) -> Iterator[str]:
+        """Yield the sheet layout SVG piece by piece so it can be streamed to the file."""
         sheet_dims = result.get('sheet_dimensions', {})
         width = sheet_dims.get('width', 100)
         height = sheet_dims.get('height', 100)
@@ -180,7 +225,7 @@ class SVGNester:
         svg_width = width + 2 * margin
         svg_height = height + 2 * margin
         
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+        yield f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg width="{svg_width}" height="{svg_height}" 
      viewBox="{-margin} {-margin} {svg_width} {svg_height}" 
      xmlns="http://www.w3.org/2000/svg">
@@ -192,32 +237,32 @@ class SVGNester:
         
         if show_grid:
             grid_size = min(width, height) / 20
-            svg_content += f'  <defs>\n'
-            svg_content += f'    <pattern id="grid" width="{grid_size}" height="{grid_size}" patternUnits="userSpaceOnUse">\n'
-            svg_content += f'      <path d="M {grid_size} 0 L 0 0 0 {grid_size}" fill="none" stroke="#e0e0e0" stroke-width="0.5"/>\n'
-            svg_content += f'    </pattern>\n'
-            svg_content += f'  </defs>\n'
-            svg_content += f'  <rect x="0" y="0" width="{width}" height="{height}" fill="url(#grid)"/>\n'
+            yield f'  <defs>\n'
+            yield f'    <pattern id="grid" width="{grid_size}" height="{grid_size}" patternUnits="userSpaceOnUse">\n'
+            yield f'      <path d="M {grid_size} 0 L 0 0 0 {grid_size}" fill="none" stroke="#e0e0e0" stroke-width="0.5"/>\n'
+            yield f'    </pattern>\n'
+            yield f'  </defs>\n'
+            yield f'  <rect x="0" y="0" width="{width}" height="{height}" fill="url(#grid)"/>\n'
         
         for i, placement in enumerate(result['placements']):
-            points_str = ' '.join([f'{p.x},{p.y}' for p in placement['polygon']])
-            svg_content += f'  <polygon points="{points_str}" '
-            svg_content += f'fill="lightblue" fill-opacity="0.7" stroke="blue" stroke-width="1"/>\n'
+            points_str = _svg_points(placement['polygon'])
+            yield f'  <polygon points="{points_str}" '
+            yield f'fill="lightblue" fill-opacity="0.7" stroke="blue" stroke-width="1"/>\n'
         
         if show_dimensions:
-            svg_content += f'  <text x="{width/2}" y="-{margin/3}" text-anchor="middle" '
-            svg_content += f'font-family="Arial" font-size="{margin/4}" fill="black">'
-            svg_content += f'{width} {units}</text>\n'
+            yield f'  <text x="{width/2}" y="-{margin/3}" text-anchor="middle" '
+            yield f'font-family="Arial" font-size="{margin/4}" fill="black">'
+            yield f'{width} {units}</text>\n'
             
-            svg_content += f'  <text x="-{margin/3}" y="{height/2}" text-anchor="middle" '
-            svg_content += f'font-family="Arial" font-size="{margin/4}" fill="black" '
-            svg_content += f'transform="rotate(-90, -{margin/3}, {height/2})">'
-            svg_content += f'{height} {units}</text>\n'
+            yield f'  <text x="-{margin/3}" y="{height/2}" text-anchor="middle" '
+            yield f'font-family="Arial" font-size="{margin/4}" fill="black" '
+            yield f'transform="rotate(-90, -{margin/3}, {height/2})">'
+            yield f'{height} {units}</text>\n'
         
         stats_y = height + margin * 0.3
         font_size = margin / 5
         
-        svg_content += f'''  
+        yield f'''  
   <text x="0" y="{stats_y}" font-family="Arial" font-size="{font_size}" fill="black">
     Parts: {result.get('actual_quantity', 0)} | Utilization: {result.get('utilization', 0):.1f}% | Efficiency: {result.get('efficiency', 0):.1f}%
   </text>
@@ -226,12 +271,7 @@ class SVGNester:
   </text>
 '''
         
-        svg_content += '</svg>'
-        
-        with open(output_path, 'w') as f:
-            f.write(svg_content)
-        
-        print(f"Sheet layout saved to {output_path}")
+        yield '</svg>'
     
     def set_parts(self, parts: List[Polygon], quantities: Optional[Union[int, List[int]]] = None):
         if quantities is None:
@@ -249,7 +289,7 @@ class SVGNester:
         for i, (part, quantity) in enumerate(zip(parts, quantities)):
             self.part_quantities[i] = quantity
             for copy_num in range(quantity):
-                new_part = Polygon(part.points.copy())
+                new_part = part.copy()
                 new_part.id = len(self.parts)
                 new_part.original_id = i
                 new_part.copy_number = copy_num
@@ -276,7 +316,7 @@ class SVGNester:
         current_quantity = self.part_quantities.get(part_index, 0)
         
         for copy_num in range(current_quantity, current_quantity + additional_copies):
-            new_part = Polygon(original_part.points.copy())
+            new_part = original_part.copy()
             new_part.id = len(self.parts)
             new_part.original_id = part_index
             new_part.copy_number = copy_num
@@ -308,7 +348,7 @@ class SVGNester:
         
         result.update({
             'success': True,
-            'utilization': self._calculate_utilization(result['placements']),
+            'utilization': self._calculate_utilization(result['placements'], result.get('total_placed_area')),
             'total_original_parts': len(self.original_parts) if hasattr(self, 'original_parts') else len(set(p.original_id for p in self.parts if hasattr(p, 'original_id'))),
             'total_part_instances': len(self.parts),
             'placed_instances': len(result['placements']),
@@ -318,23 +358,28 @@ class SVGNester:
         
         return result
     
-    def _calculate_utilization(self, placements: List[Dict]) -> float:
+    def _calculate_utilization(self, placements: List[Dict], total_part_area: Optional[float] = None) -> float:
         if not placements or not self.container:
             return 0
         
         from geometry_util import polygon_area
         
-        container_area = abs(polygon_area(self.container.points))
+        container_area = abs(polygon_area(self.container))
         if container_area == 0:
             return 0
         
-        total_part_area = 0
-        for placement in placements:
-            total_part_area += abs(polygon_area(placement['polygon']))
+        # The solver reports the placed area directly; otherwise rotation and
+        # translation preserve area, so placed parts reuse the cached area of
+        # their source polygon instead of re-running the shoelace sum.
+        if total_part_area is None:
+            total_part_area = 0
+            for placement in placements:
+                source = self.parts[placement['id']] if placement['id'] < len(self.parts) else placement['polygon']
+                total_part_area += abs(polygon_area(source))
         
         return (total_part_area / container_area) * 100
     
-    def export_result(self, result: Dict, output_path: str):
+    def export_result(self, result: Dict, output_path: str, indent: Optional[int] = 2):
         export_data = {
             'success': result['success'],
             'fitness': result['fitness'],
@@ -352,6 +397,7 @@ class SVGNester:
         }
         
         for placement in result['placements']:
+            xs, ys = polygon_coords(placement['polygon'])
             placement_data = {
                 'id': placement['id'],
                 'original_id': getattr(self.parts[placement['id']], 'original_id', placement['id']) if placement['id'] < len(self.parts) else placement['id'],
@@ -359,31 +405,41 @@ class SVGNester:
                 'x': placement['x'],
                 'y': placement['y'],
                 'rotation': placement['rotation'],
-                'points': [{'x': p.x, 'y': p.y} for p in placement['polygon']]
+                'points': [{'x': x, 'y': y} for x, y in zip(xs, ys)]
             }
             export_data['placements'].append(placement_data)
         
+        # json.dumps encodes in one pass (with the C encoder when indent is None)
+        # where json.dump would issue a write per token
         with open(output_path, 'w') as f:
-            json.dump(export_data, f, indent=2)
+            f.write(json.dumps(export_data, indent=indent))
     
     def create_result_svg(self, result: Dict, output_path: str, show_part_labels: bool = True):
         if not result['placements']:
             return
         
-        from geometry_util import get_polygon_bounds
+        with open(output_path, 'w', buffering=1 << 20) as f:
+            f.writelines(self._result_svg_chunks(result, show_part_labels))
+    
+    def _result_svg_chunks(self, result: Dict, show_part_labels: bool) -> Iterator[str]:
+        """Yield the result SVG piece by piece so it can be streamed to the file."""
+        from geometry_util import get_polygon_bounds_xy
         
-        all_points = []
+        all_xs = []
+        all_ys = []
         for placement in result['placements']:
-            all_points.extend(placement['polygon'])
+            xs, ys = polygon_coords(placement['polygon'])
+            all_xs.extend(xs)
+            all_ys.extend(ys)
         
-        bounds = get_polygon_bounds(all_points)
+        bounds = get_polygon_bounds_xy(all_xs, all_ys)
         
-        svg_content = f'''<?xml version="1.0" encoding="UTF-8"?>
+        yield f'''<?xml version="1.0" encoding="UTF-8"?>
 <svg width="{bounds['width'] + 20}" height="{bounds['height'] + 20}" 
      viewBox="{bounds['x'] - 10} {bounds['y'] - 10} {bounds['width'] + 20} {bounds['height'] + 20}" 
      xmlns="http://www.w3.org/2000/svg">
   
-  <polygon points="{' '.join([f'{p.x},{p.y}' for p in self.container.points])}" 
+  <polygon points="{_svg_points(self.container)}" 
            fill="none" stroke="black" stroke-width="2"/>
   
 '''
@@ -396,26 +452,24 @@ class SVGNester:
             copy_number = getattr(self.parts[part_id], 'copy_number', 0) if part_id < len(self.parts) else 0
             
             color = colors[original_id % len(colors)]
-            points_str = ' '.join([f'{p.x},{p.y}' for p in placement['polygon']])
+            points_str = _svg_points(placement['polygon'])
             
-            svg_content += f'''  <polygon points="{points_str}" 
+            yield f'''  <polygon points="{points_str}" 
            fill="{color}" fill-opacity="0.5" stroke="{color}" stroke-width="1"/>
 '''
             
             if show_part_labels:
-                center_x = sum(p.x for p in placement['polygon']) / len(placement['polygon'])
-                center_y = sum(p.y for p in placement['polygon']) / len(placement['polygon'])
+                xs, ys = polygon_coords(placement['polygon'])
+                center_x = sum(xs) / len(xs)
+                center_y = sum(ys) / len(ys)
                 
                 label = f"{original_id}.{copy_number + 1}"
-                svg_content += f'''  <text x="{center_x}" y="{center_y}" 
+                yield f'''  <text x="{center_x}" y="{center_y}" 
            text-anchor="middle" dominant-baseline="middle" 
            font-family="Arial" font-size="8" fill="black">{label}</text>
 '''
         
-        svg_content += '</svg>'
-        
-        with open(output_path, 'w') as f:
-            f.write(svg_content)
+        yield '</svg>'
     
     def print_nesting_summary(self, result: Dict):
         print("=== Nesting Summary ===")
@@ -448,6 +502,15 @@ class SVGNester:
         print(f"\nMessage: {result.get('message', 'N/A')}")
 
 
+def _attempt_nest(part: Polygon, quantity: int, container: Polygon, config: Dict) -> Dict:
+    """Nest quantity copies of part on a fresh nester; module-level so worker processes can run it."""
+    nester = SVGNester()
+    nester.configure(config)
+    nester.set_container(container)
+    nester.set_parts([part], quantity)
+    return nester.nest()
+
+
 def main():
     nester = SVGNester()
     
@@ -2,85 +2,116 @@
 
 import re
 import math
-import xml.etree.ElementTree as ET
-from typing import List, Dict, Optional, Tuple, Union
-from geometry_util import Point, Polygon, degrees_to_radians
+from functools import lru_cache
+from itertools import accumulate
+from typing import List, Dict, Iterable, Iterator, Optional, Tuple, Union
+from geometry_util import Polygon, degrees_to_radians
+
+# lxml parses large documents considerably faster; fall back to the standard library without it
+try:
+    from lxml import etree as ET
+    HAS_LXML = True
+    # Drop comments and processing instructions, whose tags are not strings in lxml
+    _PARSER_OPTIONS = {'remove_comments': True, 'remove_pis': True, 'huge_tree': True}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
+    _PARSER_OPTIONS = {}
+
+_POINTS_SEPARATOR_RE = re.compile(r'[,\s]+')
+_PATH_COMMAND_RE = re.compile(r'([MmLlHhVvZz])([^MmLlHhVvZz]*)')
+_PATH_NUMBER_RE = re.compile(r'-?\d*\.?\d+')
+
+
+@lru_cache(maxsize=64)
+def _unit_circle(segments: int) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    """Cosines and sines of ``segments`` evenly spaced angles around the unit circle."""
+    angles = [2 * math.pi * i / segments for i in range(segments)]
+    return tuple(map(math.cos, angles)), tuple(map(math.sin, angles))
+
 
 class SVGParser:
     def __init__(self):
         self.tolerance = 2.0
         self.allowed_elements = ['svg', 'circle', 'ellipse', 'path', 'polygon', 'polyline', 'rect', 'line']
+        self._converters = {
+            'rect': self._rect_to_polygon,
+            'circle': self._circle_to_polygon,
+            'ellipse': self._ellipse_to_polygon,
+            'polygon': self._polygon_to_polygon,
+            'polyline': self._polyline_to_polygon,
+            'line': self._line_to_polygon,
+            'path': self._path_to_polygon
+        }
     
     def set_tolerance(self, tolerance: float):
         self.tolerance = tolerance
     
     def parse_svg_string(self, svg_string: str) -> List[Polygon]:
         try:
-            root = ET.fromstring(svg_string)
+            if HAS_LXML:
+                # lxml rejects str input that carries an encoding declaration
+                root = ET.fromstring(svg_string.encode('utf-8'), ET.XMLParser(**_PARSER_OPTIONS))
+            else:
+                root = ET.fromstring(svg_string)
             return self._extract_polygons(root)
         except ET.ParseError as e:
             raise ValueError(f"Invalid SVG: {e}")
     
     def parse_svg_file(self, file_path: str) -> List[Polygon]:
         try:
-            tree = ET.parse(file_path)
-            root = tree.getroot()
-            return self._extract_polygons(root)
-        except (ET.ParseError, FileNotFoundError) as e:
+            events = ET.iterparse(file_path, events=('start', 'end'), **_PARSER_OPTIONS)
+            return self._convert_elements(self._stream_elements(events))
+        except (ET.ParseError, OSError) as e:
             raise ValueError(f"Error parsing SVG file: {e}")
     
-    def _extract_polygons(self, element: ET.Element) -> List[Polygon]:
-        polygons = []
+    def _stream_elements(self, events: Iterable[Tuple[str, ET.Element]]) -> Iterator[ET.Element]:
+        """Yield elements as their start tags are parsed, clearing each once it is closed.
         
-        tag = element.tag.split('}')[-1] if '}' in element.tag else element.tag
-        
-        if tag in self.allowed_elements:
-            polygon = self._element_to_polygon(element)
-            if polygon:
-                polygons.append(polygon)
-        
-        for child in element:
-            polygons.extend(self._extract_polygons(child))
-        
-        return polygons
+        Attributes are complete at the start event, which is all the converters
+        read, and clearing finished elements keeps large files from being held
+        in memory as a full tree.
+        """
+        for event, element in events:
+            if event == 'start':
+                yield element
+            else:
+                element.clear()
     
-    def _element_to_polygon(self, element: ET.Element) -> Optional[Polygon]:
-        tag = element.tag.split('}')[-1] if '}' in element.tag else element.tag
+    def _extract_polygons(self, root: ET.Element) -> List[Polygon]:
+        # root.iter() walks the tree in document order without a Python frame per element
+        return self._convert_elements(root.iter())
+    
+    def _convert_elements(self, elements: Iterable[ET.Element]) -> List[Polygon]:
+        polygons = []
+        allowed = frozenset(self.allowed_elements)
+        converters = self._converters
         
-        if tag == 'rect':
-            return self._rect_to_polygon(element)
-        elif tag == 'circle':
-            return self._circle_to_polygon(element)
-        elif tag == 'ellipse':
-            return self._ellipse_to_polygon(element)
-        elif tag == 'polygon':
-            return self._polygon_to_polygon(element)
-        elif tag == 'polyline':
-            return self._polyline_to_polygon(element)
-        elif tag == 'line':
-            return self._line_to_polygon(element)
-        elif tag == 'path':
-            return self._path_to_polygon(element)
+        for element in elements:
+            tag = element.tag.rpartition('}')[2]
+            if tag in allowed:
+                converter = converters.get(tag)
+                if converter is not None:
+                    polygon = converter(element)
+                    if polygon:
+                        polygons.append(polygon)
         
-        return None
+        return polygons
     
     def _rect_to_polygon(self, element: ET.Element) -> Optional[Polygon]:
+        get = element.get
         try:
-            x = float(element.get('x', 0))
-            y = float(element.get('y', 0))
-            width = float(element.get('width', 0))
-            height = float(element.get('height', 0))
+            x = float(get('x', 0))
+            y = float(get('y', 0))
+            width = float(get('width', 0))
+            height = float(get('height', 0))
             
             if width <= 0 or height <= 0:
                 return None
             
-            points = [
-                Point(x, y),
-                Point(x + width, y),
-                Point(x + width, y + height),
-                Point(x, y + height)
-            ]
-            return Polygon(points)
+            right = x + width
+            bottom = y + height
+            return Polygon(xs=(x, right, right, x), ys=(y, y, bottom, bottom))
         except (ValueError, TypeError):
             return None
     
@@ -95,14 +126,9 @@ class SVGParser:
             
             segments = max(8, int(math.ceil(2 * math.pi / math.acos(1 - self.tolerance / r))))
             
-            points = []
-            for i in range(segments):
-                angle = 2 * math.pi * i / segments
-                x = cx + r * math.cos(angle)
-                y = cy + r * math.sin(angle)
-                points.append(Point(x, y))
-            
-            return Polygon(points)
+            cos, sin = _unit_circle(segments)
+            return Polygon(xs=[cx + r * c for c in cos],
+                           ys=[cy + r * s for s in sin])
         except (ValueError, TypeError):
             return None
     
@@ -119,14 +145,9 @@ class SVGParser:
             max_r = max(rx, ry)
             segments = max(8, int(math.ceil(2 * math.pi / math.acos(1 - self.tolerance / max_r))))
             
-            points = []
-            for i in range(segments):
-                angle = 2 * math.pi * i / segments
-                x = cx + rx * math.cos(angle)
-                y = cy + ry * math.sin(angle)
-                points.append(Point(x, y))
-            
-            return Polygon(points)
+            cos, sin = _unit_circle(segments)
+            return Polygon(xs=[cx + rx * c for c in cos],
+                           ys=[cy + ry * s for s in sin])
         except (ValueError, TypeError):
             return None
     
@@ -145,8 +166,7 @@ class SVGParser:
             x2 = float(element.get('x2', 0))
             y2 = float(element.get('y2', 0))
             
-            points = [Point(x1, y1), Point(x2, y2)]
-            return Polygon(points)
+            return Polygon(xs=[x1, x2], ys=[y1, y2])
         except (ValueError, TypeError):
             return None
     
@@ -154,22 +174,17 @@ class SVGParser:
         if not points_str:
             return None
         
-        points_str = re.sub(r'[,\s]+', ' ', points_str.strip())
-        coords = points_str.split()
+        coords = _POINTS_SEPARATOR_RE.sub(' ', points_str.strip()).split()
         
         if len(coords) < 4 or len(coords) % 2 != 0:
             return None
         
-        points = []
-        for i in range(0, len(coords), 2):
-            try:
-                x = float(coords[i])
-                y = float(coords[i + 1])
-                points.append(Point(x, y))
-            except (ValueError, IndexError):
-                return None
+        try:
+            values = list(map(float, coords))
+        except ValueError:
+            return None
         
-        return Polygon(points)
+        return Polygon(xs=values[0::2], ys=values[1::2])
     
     def _path_to_polygon(self, element: ET.Element) -> Optional[Polygon]:
         """Convert basic path commands to polygon (simplified)."""
@@ -177,66 +192,62 @@ class SVGParser:
         if not d:
             return None
         
-        points = []
-        commands = re.findall(r'[MmLlHhVvZz][^MmLlHhVvZz]*', d)
-        
+        xs = []
+        ys = []
         current_x, current_y = 0, 0
         start_x, start_y = 0, 0
         
-        for command in commands:
-            cmd = command[0]
-            params = re.findall(r'-?\d*\.?\d+', command[1:])
+        for command in _PATH_COMMAND_RE.finditer(d):
+            cmd = command.group(1)
+            params = list(map(float, _PATH_NUMBER_RE.findall(command.group(2))))
             
             if cmd == 'M':
                 if len(params) >= 2:
-                    current_x = float(params[0])
-                    current_y = float(params[1])
+                    current_x, current_y = params[0], params[1]
                     start_x, start_y = current_x, current_y
-                    points.append(Point(current_x, current_y))
+                    xs.append(current_x)
+                    ys.append(current_y)
             
             elif cmd == 'm':
                 if len(params) >= 2:
-                    current_x += float(params[0])
-                    current_y += float(params[1])
+                    current_x += params[0]
+                    current_y += params[1]
                     start_x, start_y = current_x, current_y
-                    points.append(Point(current_x, current_y))
-            
-            elif cmd == 'L':
-                for i in range(0, len(params), 2):
-                    if i + 1 < len(params):
-                        current_x = float(params[i])
-                        current_y = float(params[i + 1])
-                        points.append(Point(current_x, current_y))
-            
-            elif cmd == 'l':
-                for i in range(0, len(params), 2):
-                    if i + 1 < len(params):
-                        current_x += float(params[i])
-                        current_y += float(params[i + 1])
-                        points.append(Point(current_x, current_y))
-            
-            elif cmd == 'H':
-                for param in params:
-                    current_x = float(param)
-                    points.append(Point(current_x, current_y))
-            
-            elif cmd == 'h':
-                for param in params:
-                    current_x += float(param)
-                    points.append(Point(current_x, current_y))
-            
-            elif cmd == 'V':
-                for param in params:
-                    current_y = float(param)
-                    points.append(Point(current_x, current_y))
-            
-            elif cmd == 'v':
-                for param in params:
-                    current_y += float(param)
-                    points.append(Point(current_x, current_y))
-            
-            elif cmd in ['Z', 'z']:
-                if points and (points[-1].x != start_x or points[-1].y != start_y):
-                    points.append(Point(start_x, start_y))
+                    xs.append(current_x)
+                    ys.append(current_y)
+            
+            elif cmd in 'Ll':
+                # A trailing unpaired coordinate is ignored
+                n = len(params) & ~1
+                if n:
+                    new_xs = params[0:n:2]
+                    new_ys = params[1:n:2]
+                    if cmd == 'l':
+                        new_xs = list(accumulate(new_xs, initial=current_x))[1:]
+                        new_ys = list(accumulate(new_ys, initial=current_y))[1:]
+                    xs.extend(new_xs)
+                    ys.extend(new_ys)
+                    current_x, current_y = new_xs[-1], new_ys[-1]
+            
+            elif cmd in 'Hh':
+                if params:
+                    if cmd == 'h':
+                        params = list(accumulate(params, initial=current_x))[1:]
+                    xs.extend(params)
+                    ys.extend([current_y] * len(params))
+                    current_x = params[-1]
+            
+            elif cmd in 'Vv':
+                if params:
+                    if cmd == 'v':
+                        params = list(accumulate(params, initial=current_y))[1:]
+                    xs.extend([current_x] * len(params))
+                    ys.extend(params)
+                    current_y = params[-1]
+            
+            elif cmd in 'Zz':
+                if xs and (xs[-1] != start_x or ys[-1] != start_y):
+                    xs.append(start_x)
+                    ys.append(start_y)
         
-        return Polygon(points) if len(points) >= 3 else None 
\ No newline at end of file
+        return Polygon(xs=xs, ys=ys) if len(xs) >= 3 else None